@@ -19,14 +19,32 @@
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import functools
+import math
+import statistics
 import threading
 import json
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 import sys
+from collections import deque
+
+# 优先使用orjson解析JSON（C扩展实现，比标准库json快数倍），未安装时回退到标准库
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+def _json(response: requests.Response):
+    """解析JSON响应体：直接解析原始字节，省去response.json()先解码为str的开销"""
+    return _loads(response.content)
 
 # 配置
 BASE_URL = "http://localhost:8080"
@@ -43,12 +61,31 @@ API_MONITOR_HOTKEYS = f"{BASE_URL}/api/hotkey/monitor/hotkeys"
 API_MONITOR_STATS = f"{BASE_URL}/api/hotkey/monitor/stats"
 API_MONITOR_REFRESH = f"{BASE_URL}/api/hotkey/monitor/refresh"
 
+# 全局复用的HTTP会话：开启keep-alive和连接池，避免每次请求重新建立TCP连接
+# requests.Session在多线程间共享是安全的，每个线程从连接池中获取独立连接
+# 连接池大小需覆盖并发线程数（并发执行的用例、test_5的50个线程、并发准备阶段的16个线程），
+# 超出pool_maxsize的连接用完即被丢弃，无法复用
+HTTP_POOL_CONNECTIONS = 32  # 缓存的连接池个数（按host区分）
+HTTP_POOL_MAXSIZE = 128  # 单个host连接池的最大连接数（不小于test_5线程数的2倍）
+# 连接失败和网关类5xx错误自动重试，吸收偶发的网络抖动，避免误判为用例失败；重试用尽后返回最后一次响应，由用例按状态码判断
+# 读超时不重试：请求多半已被服务端计数，重发会抬高被测key的QPS，且会让轮询等待超出各自的时间上限
+HTTP_RETRY = Retry(total=3, connect=3, read=0, backoff_factor=0.1, status_forcelist=(502, 503, 504),
+                   allowed_methods=frozenset(["GET", "POST"]), raise_on_status=False)
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE,
+                       pool_block=False, max_retries=HTTP_RETRY)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+# 响应体都很小，关闭压缩以省去解压开销
+SESSION.headers.update({"Connection": "keep-alive", "Accept-Encoding": "identity"})
+
 # 测试配置
 HOT_KEY_QPS_THRESHOLD = 30.0  # 热Key QPS阈值
 WARM_KEY_QPS_THRESHOLD = 10.0  # 温Key QPS阈值
 RECORDER_MAX_CAPACITY = 15  # 访问记录最大容量
 PROMOTION_INTERVAL_MS = 5000  # 晋升间隔（毫秒）
 MIN_PRE_FILTER_THRESHOLD = 10  # 预筛选阈值最小值
+VERBOSE = False  # 是否输出等待过程等详细进度信息（--verbose开启）
 
 # 预筛选阈值计算公式：(warmKeyThreshold * promotionInterval / 1000.0) / 4
 # 设置最小值，防止阈值过低导致太多key进入accessStats
@@ -58,38 +95,113 @@ calculated_pre_filter = int((WARM_KEY_QPS_THRESHOLD * PROMOTION_INTERVAL_MS / 10
 PRE_FILTER_THRESHOLD = max(MIN_PRE_FILTER_THRESHOLD, calculated_pre_filter)
 
 # 测试结果统计
-test_results = {
-    "passed": 0,
-    "failed": 0,
-    "errors": []
-}
+class Stats:
+    # 手写__slots__而不用dataclass(slots=True)，后者需要Python 3.10+
+    __slots__ = ("passed", "failed", "errors")
+    
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        # 失败详情只保留最近1024条，脚本被循环复用时内存不会无限增长
+        self.errors = deque(maxlen=1024)
+
+
+test_results = Stats()
+# 测试用例并发执行时保护test_results
+test_results_lock = threading.Lock()
+
+# 每个测试用例的输出先缓存在当前线程中，用例结束后一次性写出，避免逐行写stdout以及并发用例输出交错
+_log_buffer = threading.local()
+_stdout_lock = threading.Lock()
+
+
+def log(message: str = ""):
+    """输出日志：在run_test中执行时写入当前用例的缓冲区，否则直接打印"""
+    buffer = getattr(_log_buffer, "lines", None)
+    if buffer is None:
+        print(message)
+    else:
+        buffer.append(message)
+
+
+def with_log_buffer(func):
+    """包装要交给工作线程执行的函数，使其log()写入调用方线程当前用例的缓冲区（list.append线程安全）"""
+    buffer = getattr(_log_buffer, "lines", None)
+    
+    @functools.wraps(func)
+    def wrapper(*args):
+        previous = getattr(_log_buffer, "lines", None)
+        _log_buffer.lines = buffer
+        try:
+            return func(*args)
+        finally:
+            _log_buffer.lines = previous
+    return wrapper
+
+
+def run_test(test_func):
+    """执行单个测试用例，结束后一次性输出该用例缓存的日志"""
+    _log_buffer.lines = []
+    try:
+        test_func()
+    finally:
+        lines = _log_buffer.lines
+        _log_buffer.lines = None
+        if lines:
+            with _stdout_lock:
+                sys.stdout.write("\n".join(lines) + "\n")
+                sys.stdout.flush()
 
 
 def log_test(test_name: str, passed: bool, message: str = ""):
-    """记录测试结果"""
+    """记录测试结果（线程安全）"""
     status = "✓ PASS" if passed else "✗ FAIL"
-    print(f"[{status}] {test_name}")
-    if message:
-        print(f"    {message}")
-    if passed:
-        test_results["passed"] += 1
-    else:
-        test_results["failed"] += 1
-        test_results["errors"].append(f"{test_name}: {message}")
+    with test_results_lock:
+        log(f"[{status}] {test_name}")
+        if message:
+            log(f"    {message}")
+        if passed:
+            test_results.passed += 1
+        else:
+            test_results.failed += 1
+            test_results.errors.append(f"{test_name}: {message}")
 
 
 def wait_for_promotion(seconds: int = 6):
     """等待热Key晋升（晋升间隔5秒，等待6秒确保完成）"""
-    print(f"    等待 {seconds} 秒，让热Key检测完成晋升...")
+    if VERBOSE:
+        log(f"    等待 {seconds} 秒，让热Key检测完成晋升...")
     time.sleep(seconds)
 
 
 def wait_for_demotion(seconds: int = 61):
     """等待热Key降级（降级间隔60秒，等待61秒确保完成）"""
-    print(f"    等待 {seconds} 秒，让热Key检测完成降级...")
+    if VERBOSE:
+        log(f"    等待 {seconds} 秒，让热Key检测完成降级...")
     time.sleep(seconds)
 
 
+def wait_until(predicate, timeout: float = 10, initial: float = 0.1, factor: float = 1.5,
+               max_delay: float = 1.0) -> bool:
+    """轮询等待条件成立（指数退避），条件成立立即返回True，超时返回False
+    
+    轮询监控接口的条件应使用check_is_hot_key.refresh等绕过缓存的调用，保证看到的是服务端最新状态
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(min(delay, max(0, deadline - time.monotonic())))
+        delay = min(delay * factor, max_delay)
+    return predicate()
+
+
+def wait_until_hot(*keys: str, timeout: float = 8) -> bool:
+    """等待所有key晋升为热Key，全部晋升后立即返回True，超时返回False（替代固定sleep等待晋升）"""
+    return wait_until(lambda: all(check_is_hot_key.refresh(key) for key in keys), timeout=timeout)
+
+
 def pass_pre_filter(key: str):
     """通过预筛选阈值：对key进行足够次数的访问以通过预筛选（10000次）"""
     batch_size = 1000
@@ -97,64 +209,226 @@ def pass_pre_filter(key: str):
     
     for i in range(pre_filter_batches):
         try:
-            requests.get(API_GET_BATCH, params={"key": key, "count": batch_size}, timeout=30)
-            time.sleep(0.1)  # 稍微延迟，避免过快
+            SESSION.get(API_GET_BATCH, params={"key": key, "count": batch_size}, timeout=30)
         except Exception as e:
-            print(f"    预筛选访问失败: {e}")
+            log(f"    预筛选访问失败: {e}")
             break
 
 
+def _fire_batches(key: str, total: int, batch_size: int = 100, workers: int = 8,
+                  timeout: int = 30) -> int:
+    """将total次访问拆成多个批量请求并发发起，返回成功访问的次数，有批次失败时记录日志
+    
+    单连接串行发起时QPS受往返延迟限制，并发后服务端统计到的QPS不再受客户端链路影响
+    """
+    if total <= 0:
+        return 0
+    counts = [min(batch_size, total - start) for start in range(0, total, batch_size)]
+    
+    def fire(count: int) -> int:
+        response = SESSION.get(API_GET_BATCH, params={"key": key, "count": count}, timeout=timeout)
+        return count if response.status_code == 200 else 0
+    
+    accessed = sum(run_concurrently(fire, counts, max_workers=min(workers, len(counts))))
+    if accessed < total:
+        log(f"    批量访问未全部成功: key={key}, 成功 {accessed}/{total} 次")
+    return accessed
+
+
+def trigger_hot_key(key: str, count: int = 500, timeout: int = 30) -> int:
+    """触发热Key：先通过预筛选阈值，再并发批量高频访问，返回批量访问成功的次数"""
+    pass_pre_filter(key)
+    return _fire_batches(key, count, timeout=timeout)
+
+
+def send_at_rate(send, target_qps: float, count: int, max_lag: Optional[float] = None) -> int:
+    """按目标QPS匀速调用send发起count次请求，返回成功（状态码200）的次数
+    
+    按单调时钟推进截止时间，请求耗时和sleep误差不会累积；落后于计划时跳过sleep追赶，保证整体速率达到目标。
+    指定max_lag时，落后超过max_lag秒便不再追赶，从当前时间重新计时，用于必须低于某个QPS上限的场景，避免追赶造成瞬时突发流量
+    """
+    interval = 1.0 / target_qps
+    success = 0
+    deadline = time.monotonic()
+    for _ in range(count):
+        deadline += interval
+        response = send()
+        if response.status_code == 200:
+            success += 1
+        now = time.monotonic()
+        if deadline > now:
+            time.sleep(deadline - now)
+        elif max_lag is not None and now - deadline > max_lag:
+            deadline = now
+    return success
+
+
+def run_concurrently(func, items, max_workers: int = 16) -> list:
+    """并发执行I/O密集型任务，按items顺序返回结果（服务端QPS统计已负责限流，无需客户端sleep）"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(with_log_buffer(func), items))
+
+
+def run_until_failure(func, items, max_workers: int = 16):
+    """并发执行准备阶段的任务，任一任务失败时立即取消尚未开始的任务并抛出异常"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        func = with_log_buffer(func)
+        pending = {executor.submit(func, item) for item in items}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    # 逐个取消而不用shutdown(cancel_futures=True)，后者需要Python 3.9+
+                    for other in pending:
+                        other.cancel()
+                    raise error
+
+
+def set_many(pairs: List[Tuple[str, str]]):
+    """批量写入多个key
+    
+    set-batch接口是对同一个key重复写入（值带序号后缀），不支持一次写入多个不同的key，
+    因此这里并发发起set请求，总耗时约为一次往返
+    """
+    run_until_failure(
+        lambda pair: SESSION.post(API_SET, params=set_params(*pair), timeout=10),
+        pairs)
+
+
+def count_accessible(keys: List[str]) -> int:
+    """并发GET一组key，返回状态码为200的key个数"""
+    return sum(run_concurrently(
+        lambda key: SESSION.get(API_GET, params={"key": key}, timeout=5).status_code == 200, keys))
+
+
+def body_equals(response: requests.Response, expected_bytes: bytes) -> bool:
+    """校验响应成功且响应体等于期望值（直接比较字节，只去除尾部空白）"""
+    return response.status_code == 200 and response.content.rstrip(b" \t\r\n") == expected_bytes
+
+
+# 每个线程复用一个参数字典：requests在发送前就会把params编码进URL，调用返回后即可安全改写
+_params_local = threading.local()
+
+
+def set_params(key: str, value: str) -> Dict[str, str]:
+    """返回当前线程复用的set请求参数字典，避免热循环中反复构建字典"""
+    params = getattr(_params_local, "set_params", None)
+    if params is None:
+        params = _params_local.set_params = {"key": None, "value": None}
+    params["key"] = key
+    params["value"] = value
+    return params
+
+
+def prepare_get(key: str) -> requests.PreparedRequest:
+    """预先构建针对单个key的GET请求（URL编码、请求头合并只做一次），循环中通过SESSION.send复用"""
+    return SESSION.prepare_request(requests.Request("GET", API_GET, params={"key": key}))
+
+
+# 监控接口结果短时缓存：同一时刻连续查询（如等待晋升后立即校验、健康检查中的多次查询）只请求一次
+MONITOR_CACHE_TTL = 0.5  # 缓存有效期（秒）
+HOT_KEY_CHECK_CACHE_TTL = 1.0  # 单个key热Key状态的缓存有效期（秒），状态只在晋升/降级周期变化，轮询等待时通过refresh读取最新状态
+MONITOR_CACHE_MAXSIZE = 256  # 缓存条目数达到此值时清理过期条目
+_monitor_cache: Dict[tuple, tuple] = {}  # (函数名, 参数) -> (结果, 过期时间)
+_monitor_cache_lock = threading.Lock()
+
+
+def ttl_cache(ttl: float = MONITOR_CACHE_TTL, fallback=None, error_label: str = "请求监控接口失败"):
+    """按参数缓存函数结果ttl秒，缓存统一存放在_monitor_cache中
+    
+    wrapper.refresh(*args)跳过缓存读取、直接请求并用成功结果更新缓存，供轮询等待使用：
+    只刷新本次查询的条目，不影响并发执行的其他用例的缓存
+    func请求失败时抛出RequestException（非200状态码通过raise_for_status抛出），响应体不是合法JSON对象时抛出
+    ValueError/AttributeError，此时记录日志并返回fallback()；失败结果不写入缓存，
+    避免一次网络错误或异常响应在整个有效期内被当作"非热Key"或"空列表"，也不会中断长时间运行测试
+    """
+    def decorator(func):
+        def refresh(*args):
+            cache_key = (func.__name__,) + args
+            now = time.monotonic()
+            try:
+                result = func(*args)
+            except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
+                log(f"    {error_label}: {type(e).__name__}: {e}")
+                return fallback() if fallback is not None else None
+            with _monitor_cache_lock:
+                if len(_monitor_cache) >= MONITOR_CACHE_MAXSIZE:
+                    # 按key缓存的条目会随测试用到的key增长，写入前先清掉已过期的条目
+                    for expired in [k for k, (_, expires) in _monitor_cache.items() if expires <= now]:
+                        del _monitor_cache[expired]
+                _monitor_cache[cache_key] = (result, now + ttl)
+            return result
+        
+        @functools.wraps(func)
+        def wrapper(*args):
+            with _monitor_cache_lock:
+                entry = _monitor_cache.get((func.__name__,) + args)
+            if entry is not None and time.monotonic() < entry[1]:
+                return entry[0]
+            return refresh(*args)
+        
+        wrapper.refresh = refresh
+        return wrapper
+    return decorator
+
+
+@ttl_cache(HOT_KEY_CHECK_CACHE_TTL, fallback=bool, error_label="检查热Key状态失败")
 def check_is_hot_key(key: str) -> bool:
     """检查指定key是否为热Key"""
-    try:
-        response = requests.get(API_MONITOR_CHECK, params={"key": key}, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("isHotKey", False)
-        return False
-    except Exception as e:
-        print(f"    检查热Key状态失败: {e}")
-        return False
+    response = SESSION.get(API_MONITOR_CHECK, params={"key": key}, timeout=5)
+    response.raise_for_status()
+    return _json(response).get("isHotKey", False)
 
 
+@ttl_cache(fallback=dict, error_label="获取监控信息失败")
 def get_monitor_info() -> Dict:
     """获取完整监控信息"""
-    try:
-        response = requests.get(API_MONITOR_INFO, timeout=5)
-        if response.status_code == 200:
-            return response.json()
-        return {}
-    except Exception as e:
-        print(f"    获取监控信息失败: {e}")
-        return {}
+    response = SESSION.get(API_MONITOR_INFO, timeout=5)
+    response.raise_for_status()
+    data = _json(response)
+    if not isinstance(data, dict):
+        raise ValueError(f"响应不是JSON对象: {type(data).__name__}")
+    return data
 
 
+@ttl_cache(fallback=list, error_label="获取热Key列表失败")
 def get_hot_keys() -> List[str]:
     """获取热Key列表"""
-    try:
-        response = requests.get(API_MONITOR_HOTKEYS, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            hot_keys = data.get("hotKeys", [])
+    response = SESSION.get(API_MONITOR_HOTKEYS, timeout=5)
+    response.raise_for_status()
+    hot_keys = _json(response).get("hotKeys", [])
+    return hot_keys if isinstance(hot_keys, list) else []
+
+
+# /info响应中是否包含hotKeys字段，首次发现缺失后改为单独请求热Key列表接口
+_info_has_hot_keys = True
+
+
+def get_hot_keys_from_info(monitor_info: Dict) -> List[str]:
+    """从完整监控信息中取热Key列表，省去一次热Key列表接口请求；字段缺失时回退到get_hot_keys"""
+    global _info_has_hot_keys
+    if _info_has_hot_keys and monitor_info.get("enabled"):
+        if "hotKeys" in monitor_info:
+            hot_keys = monitor_info["hotKeys"]
             return hot_keys if isinstance(hot_keys, list) else []
-        return []
-    except Exception as e:
-        print(f"    获取热Key列表失败: {e}")
-        return []
+        _info_has_hot_keys = False
+    return get_hot_keys()
 
 
 def test_1_basic_set_get():
     """测试1: 基础功能测试 - 正常set和get操作"""
-    print("\n" + "="*60)
-    print("测试1: 基础功能测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试1: 基础功能测试")
+    log("="*60)
     
     key = "test:basic:1"
     value = "basic_value_123"
+    value_bytes = value.encode("utf-8")  # 直接比较响应字节，避免解码响应文本
     
     try:
         # 测试set
-        response = requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
+        response = SESSION.post(API_SET, params={"key": key, "value": value}, timeout=5)
         if response.status_code == 200:
             log_test("基础SET操作", True)
         else:
@@ -162,8 +436,8 @@ def test_1_basic_set_get():
             return
         
         # 测试get
-        response = requests.get(API_GET, params={"key": key}, timeout=5)
-        if response.status_code == 200 and response.text.strip() == value:
+        response = SESSION.get(API_GET, params={"key": key}, timeout=5)
+        if body_equals(response, value_bytes):
             log_test("基础GET操作", True)
         else:
             log_test("基础GET操作", False, f"返回值: {response.text}")
@@ -174,51 +448,46 @@ def test_1_basic_set_get():
 
 def test_2_hot_key_detection():
     """测试2: 热Key检测测试 - 高频访问触发热Key"""
-    print("\n" + "="*60)
-    print("测试2: 热Key检测测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试2: 热Key检测测试")
+    log("="*60)
     
     key = "test:hotkey:1"
     value = "hotkey_value_123"
+    value_bytes = value.encode("utf-8")
+    prepared_get = prepare_get(key)  # 各次GET请求复用同一个预构建请求
+    target_qps = HOT_KEY_QPS_THRESHOLD + 10  # 40 QPS，确保超过阈值
+    target_count = int(target_qps * 10)  # 10秒内400次访问
+    total_checks = 10
+    
+    def get_ok(_) -> bool:
+        return SESSION.send(prepared_get, timeout=5).status_code == 200
+    
+    def get_matches(_) -> bool:
+        return body_equals(SESSION.send(prepared_get, timeout=5), value_bytes)
     
     try:
         # 1. 设置key
-        requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
+        SESSION.post(API_SET, params={"key": key, "value": value}, timeout=5)
         log_test("设置测试key", True)
         
         # 2. 高频访问（需要先通过预筛选阈值，然后才能触发热Key）
-        print(f"    开始高频访问 key={key}，先通过预筛选阈值{PRE_FILTER_THRESHOLD}次，然后目标QPS > {HOT_KEY_QPS_THRESHOLD}")
+        log(f"    开始高频访问 key={key}，先通过预筛选阈值{PRE_FILTER_THRESHOLD}次，然后目标QPS > {HOT_KEY_QPS_THRESHOLD}")
         start_time = time.time()
         access_count = 0
         
         # 第一步：通过预筛选阈值（使用单次访问，不是批量接口）
-        print(f"    第一步：通过预筛选阈值（需要至少{PRE_FILTER_THRESHOLD}次访问）...")
-        for i in range(PRE_FILTER_THRESHOLD):
-            response = requests.get(API_GET, params={"key": key}, timeout=5)
-            if response.status_code == 200:
-                access_count += 1
-            time.sleep(0.01)  # 稍微延迟，避免过快
+        log(f"    第一步：通过预筛选阈值（需要至少{PRE_FILTER_THRESHOLD}次访问）...")
+        # 预筛选只看访问次数，并发发起即可；之后的1秒间隔保证这批访问不计入第二步的QPS
+        access_count += sum(run_concurrently(get_ok, range(PRE_FILTER_THRESHOLD)))
         
         # 等待一下，让窗口有时间推进，避免预筛选访问影响后续QPS计算
         time.sleep(1)
         
         # 第二步：继续高频访问以触发热Key（超过阈值，持续10秒）
-        print(f"    第二步：继续高频访问以触发热Key（目标QPS > {HOT_KEY_QPS_THRESHOLD}）...")
-        target_qps = HOT_KEY_QPS_THRESHOLD + 10  # 40 QPS，确保超过阈值
-        target_count = int(target_qps * 10)  # 10秒内400次访问
-        interval = 1.0 / target_qps
-        
-        # 精确控制QPS：计算实际耗时，然后sleep剩余时间
-        for i in range(target_count):
-            request_start = time.time()
-            response = requests.get(API_GET, params={"key": key}, timeout=5)
-            if response.status_code == 200:
-                access_count += 1
-            # 精确控制QPS：计算实际耗时，然后sleep剩余时间
-            request_elapsed = time.time() - request_start
-            sleep_time = max(0, interval - request_elapsed)
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+        log(f"    第二步：继续高频访问以触发热Key（目标QPS > {HOT_KEY_QPS_THRESHOLD}）...")
+        access_count += send_at_rate(lambda: SESSION.send(prepared_get, timeout=5),
+                                     target_qps, target_count)
         
         elapsed = time.time() - start_time
         actual_qps = access_count / elapsed if elapsed > 0 else 0
@@ -228,24 +497,17 @@ def test_2_hot_key_detection():
                  f"实际QPS: {actual_qps:.2f}, 阈值: {HOT_KEY_QPS_THRESHOLD}")
         
         # 3. 等待晋升完成
-        wait_for_promotion(6)
+        wait_until_hot(key)
         
         # 4. 验证key是否被识别为热Key
-        print("    验证key是否被识别为热Key...")
+        log("    验证key是否被识别为热Key...")
         is_hot = check_is_hot_key(key)
         log_test("热Key识别验证", is_hot, 
                  f"key={key}, isHotKey={is_hot}")
         
         # 5. 验证热Key缓存是否生效（连续访问应该从缓存获取）
-        print("    验证热Key缓存是否生效...")
-        cache_hit_count = 0
-        total_checks = 10
-        
-        for i in range(total_checks):
-            response = requests.get(API_GET, params={"key": key}, timeout=5)
-            if response.status_code == 200 and response.text.strip() == value:
-                cache_hit_count += 1
-            time.sleep(0.1)
+        log("    验证热Key缓存是否生效...")
+        cache_hit_count = sum(run_concurrently(get_matches, range(total_checks)))
         
         # 如果缓存生效，应该能正常获取到值
         log_test("热Key缓存验证", cache_hit_count == total_checks, 
@@ -254,7 +516,7 @@ def test_2_hot_key_detection():
         # 6. 获取监控统计信息
         monitor_info = get_monitor_info()
         if monitor_info.get("enabled"):
-            print(f"    监控信息: 热Key数量={monitor_info.get('hotKeyCount', 0)}, "
+            log(f"    监控信息: 热Key数量={monitor_info.get('hotKeyCount', 0)}, "
                   f"命中率={monitor_info.get('hotKeyHitRate', 0)*100:.2f}%")
     
     except Exception as e:
@@ -263,27 +525,28 @@ def test_2_hot_key_detection():
 
 def test_3_warm_key_detection():
     """测试3: 温Key检测测试 - 中等频率访问触发温Key"""
-    print("\n" + "="*60)
-    print("测试3: 温Key检测测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试3: 温Key检测测试")
+    log("="*60)
     
     key = "test:warmkey:1"
     value = "warmkey_value_123"
+    value_bytes = value.encode("utf-8")
     
     try:
         # 1. 设置key
-        requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
+        SESSION.post(API_SET, params={"key": key, "value": value}, timeout=5)
         log_test("设置测试key", True)
         
         # 2. 中等频率访问（需要先通过预筛选阈值，然后10-30 QPS之间，持续10秒）
-        print(f"    开始中等频率访问 key={key}，先通过预筛选阈值{PRE_FILTER_THRESHOLD}次，然后目标QPS在 {WARM_KEY_QPS_THRESHOLD}-{HOT_KEY_QPS_THRESHOLD} 之间")
+        log(f"    开始中等频率访问 key={key}，先通过预筛选阈值{PRE_FILTER_THRESHOLD}次，然后目标QPS在 {WARM_KEY_QPS_THRESHOLD}-{HOT_KEY_QPS_THRESHOLD} 之间")
         start_time = time.time()
         access_count = 0
         
         # 第一步：通过预筛选阈值（使用单次访问，不是批量接口）
-        print(f"    第一步：通过预筛选阈值（需要至少{PRE_FILTER_THRESHOLD}次访问）...")
+        log(f"    第一步：通过预筛选阈值（需要至少{PRE_FILTER_THRESHOLD}次访问）...")
         for i in range(PRE_FILTER_THRESHOLD):
-            response = requests.get(API_GET, params={"key": key}, timeout=5)
+            response = SESSION.get(API_GET, params={"key": key}, timeout=5)
             if response.status_code == 200:
                 access_count += 1
             time.sleep(0.01)  # 稍微延迟，避免过快
@@ -292,22 +555,12 @@ def test_3_warm_key_detection():
         time.sleep(1)
         
         # 第二步：中等频率访问（10-30 QPS之间，持续10秒）
-        print(f"    第二步：中等频率访问（目标QPS在 {WARM_KEY_QPS_THRESHOLD}-{HOT_KEY_QPS_THRESHOLD} 之间）...")
+        log(f"    第二步：中等频率访问（目标QPS在 {WARM_KEY_QPS_THRESHOLD}-{HOT_KEY_QPS_THRESHOLD} 之间）...")
         target_qps = (WARM_KEY_QPS_THRESHOLD + HOT_KEY_QPS_THRESHOLD) / 2  # 20 QPS
         target_count = int(target_qps * 10)  # 10秒内200次访问
-        interval = 1.0 / target_qps  # 每次访问间隔0.05秒
-        
-        # 精确控制QPS：计算实际耗时，然后sleep剩余时间
-        for i in range(target_count):
-            request_start = time.time()
-            response = requests.get(API_GET, params={"key": key}, timeout=5)
-            if response.status_code == 200:
-                access_count += 1
-            # 精确控制QPS：计算实际耗时，然后sleep剩余时间
-            request_elapsed = time.time() - request_start
-            sleep_time = max(0, interval - request_elapsed)
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+        # 温Key的QPS必须低于热Key阈值，落后时不追赶，避免突发流量被识别为热Key
+        access_count += send_at_rate(lambda: SESSION.get(API_GET, params={"key": key}, timeout=5),
+                                     target_qps, target_count, max_lag=1.0)
         
         elapsed = time.time() - start_time
         actual_qps = access_count / elapsed if elapsed > 0 else 0
@@ -320,8 +573,8 @@ def test_3_warm_key_detection():
         wait_for_promotion(6)
         
         # 4. 验证值仍然可以正常获取
-        response = requests.get(API_GET, params={"key": key}, timeout=5)
-        log_test("温Key访问验证", response.status_code == 200 and response.text.strip() == value,
+        response = SESSION.get(API_GET, params={"key": key}, timeout=5)
+        log_test("温Key访问验证", body_equals(response, value_bytes),
                  f"返回值: {response.text.strip()}")
     
     except Exception as e:
@@ -330,44 +583,31 @@ def test_3_warm_key_detection():
 
 def test_4_capacity_limit():
     """测试4: 容量限制测试 - 测试recorderMaxCapacity=15的限制"""
-    print("\n" + "="*60)
-    print("测试4: 容量限制测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试4: 容量限制测试")
+    log("="*60)
     
     try:
         # 创建超过容量限制的key（16个key，超过15的限制）
-        print(f"    创建 {RECORDER_MAX_CAPACITY + 1} 个不同的key（超过容量限制{RECORDER_MAX_CAPACITY}）")
+        log(f"    创建 {RECORDER_MAX_CAPACITY + 1} 个不同的key（超过容量限制{RECORDER_MAX_CAPACITY}）")
         
-        keys = []
-        for i in range(RECORDER_MAX_CAPACITY + 1):
-            key = f"test:capacity:{i}"
-            value = f"value_{i}"
-            requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
-            keys.append(key)
+        pairs = [(f"test:capacity:{i}", f"value_{i}") for i in range(RECORDER_MAX_CAPACITY + 1)]
+        set_many(pairs)
+        keys = [key for key, _ in pairs]
         
         log_test(f"创建 {len(keys)} 个key", True)
         
         # 对每个key进行高频访问（需要先通过预筛选阈值，然后触发容量限制）
-        print(f"    对每个key进行高频访问（先通过预筛选阈值{PRE_FILTER_THRESHOLD}次，然后触发容量清理）...")
-        for key in keys:
-            # 第一步：通过预筛选阈值（至少10000次访问）
-            batch_size = 1000
-            pre_filter_batches = (PRE_FILTER_THRESHOLD + batch_size - 1) // batch_size
-            for i in range(pre_filter_batches):
-                requests.get(API_GET_BATCH, params={"key": key, "count": batch_size}, timeout=30)
-                time.sleep(0.1)
-            # 第二步：继续访问以触发容量限制
-            requests.get(API_GET_BATCH, params={"key": key, "count": 100}, timeout=10)
+        log(f"    对每个key进行高频访问（先通过预筛选阈值{PRE_FILTER_THRESHOLD}次，然后触发容量清理）...")
+        # 先通过预筛选阈值，再继续访问以触发容量限制（各key同时开始，避免访问时间先后影响清理结果）
+        run_until_failure(lambda k: trigger_hot_key(k, count=100, timeout=10), keys,
+                          max_workers=len(keys))
         
         # 等待清理完成
         wait_for_promotion(6)
         
         # 验证：至少前几个key应该还能正常访问
-        success_count = 0
-        for i, key in enumerate(keys[:5]):  # 检查前5个key
-            response = requests.get(API_GET, params={"key": key}, timeout=5)
-            if response.status_code == 200:
-                success_count += 1
+        success_count = count_accessible(keys[:5])  # 检查前5个key
         
         log_test("容量限制后key访问验证", success_count > 0,
                  f"成功访问: {success_count}/5 个key（容量限制可能导致部分key被清理）")
@@ -378,42 +618,43 @@ def test_4_capacity_limit():
 
 def test_5_concurrent_access():
     """测试5: 并发访问测试 - 多线程并发访问"""
-    print("\n" + "="*60)
-    print("测试5: 并发访问测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试5: 并发访问测试")
+    log("="*60)
     
     key = "test:concurrent:1"
     value = "concurrent_value_123"
-    thread_count = 10
-    requests_per_thread = 50
+    value_bytes = value.encode("utf-8")
+    thread_count = 50
+    requests_per_thread = 200  # 共1万次请求，由连接池而非sleep限制并发
     
     try:
         # 1. 设置key
-        requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
+        SESSION.post(API_SET, params={"key": key, "value": value}, timeout=5)
         log_test("设置测试key", True)
         
         # 2. 多线程并发访问
-        print(f"    启动 {thread_count} 个线程，每个线程访问 {requests_per_thread} 次")
+        log(f"    启动 {thread_count} 个线程，每个线程访问 {requests_per_thread} 次")
+        
+        prepared_get = prepare_get(key)
         
         def worker(thread_id: int) -> Tuple[int, int]:
             success = 0
             failed = 0
             for i in range(requests_per_thread):
                 try:
-                    response = requests.get(API_GET, params={"key": key}, timeout=5)
-                    if response.status_code == 200 and response.text.strip() == value:
+                    response = SESSION.send(prepared_get, timeout=5)
+                    if body_equals(response, value_bytes):
                         success += 1
                     else:
                         failed += 1
                 except Exception as e:
                     failed += 1
-                time.sleep(0.01)  # 稍微延迟
             return success, failed
         
         start_time = time.time()
         with ThreadPoolExecutor(max_workers=thread_count) as executor:
-            futures = [executor.submit(worker, i) for i in range(thread_count)]
-            results = [f.result() for f in as_completed(futures)]
+            results = list(executor.map(worker, range(thread_count)))
         
         elapsed = time.time() - start_time
         total_success = sum(r[0] for r in results)
@@ -430,41 +671,39 @@ def test_5_concurrent_access():
 
 def test_6_cache_hit_rate():
     """测试6: 缓存命中率测试 - 验证热Key缓存命中率"""
-    print("\n" + "="*60)
-    print("测试6: 缓存命中率测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试6: 缓存命中率测试")
+    log("="*60)
     
     key = "test:cache:1"
     value = "cache_value_123"
+    value_bytes = value.encode("utf-8")
+    prepared_get = prepare_get(key)
     
     try:
         # 1. 设置key
-        requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
+        SESSION.post(API_SET, params={"key": key, "value": value}, timeout=5)
         log_test("设置测试key", True)
         
         # 2. 高频访问触发热Key（需要先通过预筛选阈值）
-        print(f"    高频访问触发热Key（先通过预筛选阈值{PRE_FILTER_THRESHOLD}次）...")
+        log(f"    高频访问触发热Key（先通过预筛选阈值{PRE_FILTER_THRESHOLD}次）...")
         pass_pre_filter(key)
         # 继续高频访问以触发热Key
-        requests.get(API_GET_BATCH, params={"key": key, "count": 500}, timeout=30)
-        wait_for_promotion(6)
+        _fire_batches(key, 500)
+        wait_until_hot(key)
         
         # 3. 连续访问，验证缓存命中
-        print("    连续访问验证缓存命中...")
-        hit_count = 0
-        miss_count = 0
+        log("    连续访问验证缓存命中...")
         total_checks = 100
         
-        for i in range(total_checks):
-            response = requests.get(API_GET, params={"key": key}, timeout=5)
-            if response.status_code == 200:
-                if response.text.strip() == value:
-                    hit_count += 1
-                else:
-                    miss_count += 1
-            else:
-                miss_count += 1
-            time.sleep(0.05)
+        def check_once(_) -> bool:
+            response = SESSION.send(prepared_get, timeout=5)
+            return body_equals(response, value_bytes)
+        
+        # 并发发起所有校验请求，统计命中次数
+        # 注意：get-batch接口只返回最后一次获取的值，无法反映每次访问是否命中，因此这里仍逐次校验
+        results = run_concurrently(check_once, range(total_checks))
+        hit_count = sum(results)
         
         hit_rate = hit_count / total_checks * 100 if total_checks > 0 else 0
         log_test(f"缓存命中率验证 (命中: {hit_count}/{total_checks}, 命中率: {hit_rate:.2f}%)",
@@ -477,9 +716,9 @@ def test_6_cache_hit_rate():
 
 def test_7_edge_cases():
     """测试7: 边界情况测试 - 空值、特殊字符、超长key等"""
-    print("\n" + "="*60)
-    print("测试7: 边界情况测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试7: 边界情况测试")
+    log("="*60)
     
     test_cases = [
         ("test:empty:value", ""),  # 空值
@@ -491,7 +730,7 @@ def test_7_edge_cases():
     try:
         for key, value in test_cases:
             # 设置
-            response = requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
+            response = SESSION.post(API_SET, params={"key": key, "value": value}, timeout=5)
             if response.status_code == 200:
                 log_test(f"设置边界key: {key[:30]}", True)
             else:
@@ -499,7 +738,7 @@ def test_7_edge_cases():
                 continue
             
             # 获取
-            response = requests.get(API_GET, params={"key": key}, timeout=5)
+            response = SESSION.get(API_GET, params={"key": key}, timeout=5)
             if response.status_code == 200 and response.text == value:
                 log_test(f"获取边界key: {key[:30]}", True)
             else:
@@ -512,14 +751,14 @@ def test_7_edge_cases():
 
 def test_8_key_not_exists():
     """测试8: 不存在的key测试"""
-    print("\n" + "="*60)
-    print("测试8: 不存在的key测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试8: 不存在的key测试")
+    log("="*60)
     
     key = "test:nonexistent:999999"
     
     try:
-        response = requests.get(API_GET, params={"key": key}, timeout=5)
+        response = SESSION.get(API_GET, params={"key": key}, timeout=5)
         # 不存在的key应该返回空或特定状态码，不应该崩溃
         log_test("访问不存在的key", response.status_code in [200, 404],
                  f"状态码: {response.status_code}, 响应: {response.text[:50]}")
@@ -530,35 +769,29 @@ def test_8_key_not_exists():
 
 def test_9_multiple_hot_keys():
     """测试9: 多个热Key测试 - 同时存在多个热Key"""
-    print("\n" + "="*60)
-    print("测试9: 多个热Key测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试9: 多个热Key测试")
+    log("="*60)
     
     hot_key_count = 5
-    keys = []
     
     try:
         # 1. 创建多个key
-        for i in range(hot_key_count):
-            key = f"test:multihot:{i}"
-            value = f"multihot_value_{i}"
-            requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
-            keys.append(key)
+        pairs = [(f"test:multihot:{i}", f"multihot_value_{i}") for i in range(hot_key_count)]
+        set_many(pairs)
+        keys = [key for key, _ in pairs]
         
         log_test(f"创建 {hot_key_count} 个测试key", True)
         
         # 2. 对每个key进行高频访问（需要先通过预筛选阈值）
-        print(f"    对每个key进行高频访问（先通过预筛选阈值{PRE_FILTER_THRESHOLD}次，然后触发热Key）...")
-        for key in keys:
-            pass_pre_filter(key)
-            # 继续高频访问以触发热Key
-            requests.get(API_GET_BATCH, params={"key": key, "count": 500}, timeout=30)
+        log(f"    对每个key进行高频访问（先通过预筛选阈值{PRE_FILTER_THRESHOLD}次，然后触发热Key）...")
+        run_until_failure(trigger_hot_key, keys)
         
         # 3. 等待晋升完成
-        wait_for_promotion(6)
+        wait_until(lambda: set(keys) <= set(get_hot_keys.refresh()), timeout=8)
         
         # 4. 验证所有key是否都被识别为热Key
-        print("    验证所有key是否都被识别为热Key...")
+        log("    验证所有key是否都被识别为热Key...")
         hot_key_list = get_hot_keys()
         detected_hot_keys = [k for k in keys if k in hot_key_list]
         log_test(f"热Key识别验证 (识别: {len(detected_hot_keys)}/{hot_key_count})",
@@ -566,11 +799,7 @@ def test_9_multiple_hot_keys():
                  f"识别的热Key: {detected_hot_keys}")
         
         # 5. 验证所有key都能正常访问
-        success_count = 0
-        for key in keys:
-            response = requests.get(API_GET, params={"key": key}, timeout=5)
-            if response.status_code == 200:
-                success_count += 1
+        success_count = count_accessible(keys)
         
         log_test(f"多个热Key访问验证 (成功: {success_count}/{hot_key_count})",
                  success_count == hot_key_count,
@@ -582,42 +811,46 @@ def test_9_multiple_hot_keys():
 
 def test_10_value_update():
     """测试10: 值更新测试 - 热Key的值在Redis中更新后，缓存是否自动刷新"""
-    print("\n" + "="*60)
-    print("测试10: 值更新测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试10: 值更新测试")
+    log("="*60)
     
     key = "test:update:1"
     value1 = "value_original"
     value2 = "value_updated"
+    value1_bytes = value1.encode("utf-8")
+    value2_bytes = value2.encode("utf-8")
     
     try:
         # 1. 设置初始值
-        requests.post(API_SET, params={"key": key, "value": value1}, timeout=5)
+        SESSION.post(API_SET, params={"key": key, "value": value1}, timeout=5)
         log_test("设置初始值", True)
         
         # 2. 高频访问触发热Key（需要先通过预筛选阈值）
         pass_pre_filter(key)
         # 继续高频访问以触发热Key
-        requests.get(API_GET_BATCH, params={"key": key, "count": 500}, timeout=30)
-        wait_for_promotion(6)
+        _fire_batches(key, 500)
+        wait_until_hot(key)
         
         # 3. 验证缓存中的值
-        response = requests.get(API_GET, params={"key": key}, timeout=5)
-        log_test("验证缓存中的初始值", response.text.strip() == value1,
+        response = SESSION.get(API_GET, params={"key": key}, timeout=5)
+        log_test("验证缓存中的初始值", body_equals(response, value1_bytes),
                  f"返回值: {response.text.strip()}")
         
         # 4. 更新Redis中的值
-        requests.post(API_SET, params={"key": key, "value": value2}, timeout=5)
+        SESSION.post(API_SET, params={"key": key, "value": value2}, timeout=5)
         log_test("更新Redis中的值", True)
         
-        # 5. 等待自动刷新（刷新间隔10秒）
-        print("    等待自动刷新（刷新间隔10秒）...")
-        time.sleep(12)
+        # 5. 等待自动刷新（刷新间隔10秒），值更新后立即结束等待，最长等待15秒
+        log("    等待自动刷新（刷新间隔10秒，最长等待15秒）...")
+        updated = wait_until(
+            lambda: body_equals(SESSION.get(API_GET, params={"key": key}, timeout=5), value2_bytes),
+            timeout=15, initial=0.5)
         
         # 6. 验证缓存是否更新
-        response = requests.get(API_GET, params={"key": key}, timeout=5)
-        log_test("验证缓存是否自动更新", response.text.strip() == value2,
-                 f"期望: {value2}, 实际: {response.text.strip()}")
+        actual = value2 if updated else SESSION.get(API_GET, params={"key": key}, timeout=5).text.strip()
+        log_test("验证缓存是否自动更新", updated,
+                 f"期望: {value2}, 实际: {actual}")
     
     except Exception as e:
         log_test("值更新测试", False, str(e))
@@ -625,43 +858,45 @@ def test_10_value_update():
 
 def test_11_delete_hot_key():
     """测试11: 删除操作测试 - 删除热Key后，本地缓存是否被清理"""
-    print("\n" + "="*60)
-    print("测试11: 删除操作测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试11: 删除操作测试")
+    log("="*60)
     
     key = "test:delete:hotkey:1"
     value = "delete_test_value"
+    value_bytes = value.encode("utf-8")
+    prepared_get = prepare_get(key)
     
     try:
         # 1. 设置key
-        requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
+        SESSION.post(API_SET, params={"key": key, "value": value}, timeout=5)
         log_test("设置测试key", True)
         
         # 2. 高频访问触发热Key（需要先通过预筛选阈值）
         pass_pre_filter(key)
         # 继续高频访问以触发热Key
-        requests.get(API_GET_BATCH, params={"key": key, "count": 500}, timeout=30)
-        wait_for_promotion(6)
+        _fire_batches(key, 500)
+        wait_until_hot(key)
         
         # 3. 验证key是否为热Key
         is_hot = check_is_hot_key(key)
         log_test("验证key是否为热Key", is_hot, f"isHotKey={is_hot}")
         
         # 4. 验证缓存是否生效（能正常获取）
-        response = requests.get(API_GET, params={"key": key}, timeout=5)
-        log_test("验证删除前缓存是否生效", response.status_code == 200 and response.text.strip() == value,
+        response = SESSION.send(prepared_get, timeout=5)
+        log_test("验证删除前缓存是否生效", body_equals(response, value_bytes),
                  f"返回值: {response.text.strip()}")
         
         # 5. 尝试删除key（如果API存在）
         try:
-            del_response = requests.post(API_DEL, params={"key": key}, timeout=5)
+            del_response = SESSION.post(API_DEL, params={"key": key}, timeout=5)
             if del_response.status_code == 200:
                 log_test("删除key操作", True)
                 # 等待异步清理完成
                 time.sleep(1)
                 
                 # 6. 验证删除后key是否不存在
-                get_response = requests.get(API_GET, params={"key": key}, timeout=5)
+                get_response = SESSION.send(prepared_get, timeout=5)
                 # 删除后应该返回空或特定状态码
                 log_test("验证删除后key是否不存在", 
                         get_response.status_code in [200, 404] or "不存在" in get_response.text or get_response.text.strip() == "",
@@ -673,7 +908,7 @@ def test_11_delete_hot_key():
                 # 所以这里只验证缓存被清理，不验证热Key状态
                 time.sleep(1)
                 # 再次获取应该从Redis获取（因为缓存已清理），但Redis中key已被删除，所以返回不存在
-                get_response2 = requests.get(API_GET, params={"key": key}, timeout=5)
+                get_response2 = SESSION.send(prepared_get, timeout=5)
                 # 缓存应该已被清理，所以不会从缓存返回旧值
                 log_test("验证删除后缓存是否被清理", 
                         get_response2.status_code in [200, 404] or "不存在" in get_response2.text or get_response2.text.strip() == "",
@@ -691,23 +926,23 @@ def test_11_delete_hot_key():
 
 def test_12_hot_key_demotion():
     """测试12: 热Key降级测试 - 热Key访问频率降低后，是否会被降级"""
-    print("\n" + "="*60)
-    print("测试12: 热Key降级测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试12: 热Key降级测试")
+    log("="*60)
     
     key = "test:demotion:1"
     value = "demotion_test_value"
     
     try:
         # 1. 设置key
-        requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
+        SESSION.post(API_SET, params={"key": key, "value": value}, timeout=5)
         log_test("设置测试key", True)
         
         # 2. 高频访问触发热Key（需要先通过预筛选阈值）
-        print(f"    高频访问触发热Key（先通过预筛选阈值{PRE_FILTER_THRESHOLD}次）...")
+        log(f"    高频访问触发热Key（先通过预筛选阈值{PRE_FILTER_THRESHOLD}次）...")
         # 第一步：通过预筛选阈值（使用单次访问）
         for i in range(PRE_FILTER_THRESHOLD):
-            requests.get(API_GET, params={"key": key}, timeout=5)
+            SESSION.get(API_GET, params={"key": key}, timeout=5)
             time.sleep(0.01)
         
         # 等待一下，让窗口有时间推进
@@ -716,17 +951,10 @@ def test_12_hot_key_demotion():
         # 第二步：继续高频访问以触发热Key（超过阈值，持续10秒）
         target_qps = HOT_KEY_QPS_THRESHOLD + 10  # 40 QPS，确保超过阈值
         target_count = int(target_qps * 10)  # 10秒内400次访问
-        interval = 1.0 / target_qps
-        
-        for i in range(target_count):
-            request_start = time.time()
-            requests.get(API_GET, params={"key": key}, timeout=5)
-            request_elapsed = time.time() - request_start
-            sleep_time = max(0, interval - request_elapsed)
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+        send_at_rate(lambda: SESSION.get(API_GET, params={"key": key}, timeout=5),
+                     target_qps, target_count)
         
-        wait_for_promotion(6)
+        wait_until_hot(key)
         
         # 3. 验证key是否为热Key
         is_hot_before = check_is_hot_key(key)
@@ -739,25 +967,16 @@ def test_12_hot_key_demotion():
         # 4. 停止高频访问，让访问频率降低（低于阈值）
         #    注意：系统降级任务每20次晋升才执行一次，且晋升间隔为5秒 -> 约105秒才会触发一次降级
         #    此处采用轮询方式等待降级完成，最长等待130秒，避免误判
-        print(f"    停止高频访问，等待降级（轮询最长130秒）...")
-        demoted = False
-        demotion_wait_seconds = 130
-        poll_interval = 5
-        start_wait = time.time()
-        while time.time() - start_wait < demotion_wait_seconds:
-            time.sleep(poll_interval)
-            is_hot_after = check_is_hot_key(key)
-            if not is_hot_after:
-                demoted = True
-                break
+        log(f"    停止高频访问，等待降级（轮询最长130秒）...")
+        demoted = wait_until(lambda: not check_is_hot_key.refresh(key), timeout=130, initial=1, max_delay=5)
         
         # 5. 验证key是否被降级
         log_test("验证降级后是否仍为热Key", demoted,
                  f"降级后isHotKey={'False' if demoted else 'True'}（期望为False）")
         
         # 6. 验证降级后key仍能正常访问（从Redis获取）
-        response = requests.get(API_GET, params={"key": key}, timeout=5)
-        log_test("验证降级后key是否仍能正常访问", response.status_code == 200 and response.text.strip() == value,
+        response = SESSION.get(API_GET, params={"key": key}, timeout=5)
+        log_test("验证降级后key是否仍能正常访问", body_equals(response, value.encode("utf-8")),
                  f"返回值: {response.text.strip()}")
     
     except Exception as e:
@@ -766,51 +985,46 @@ def test_12_hot_key_demotion():
 
 def test_13_write_triggers_cache_update():
     """测试13: 写操作触发缓存更新测试 - 写入热Key后，本地缓存是否自动更新"""
-    print("\n" + "="*60)
-    print("测试13: 写操作触发缓存更新测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试13: 写操作触发缓存更新测试")
+    log("="*60)
     
     key = "test:write:cache:1"
     value1 = "write_value_1"
     value2 = "write_value_2"
+    value1_bytes = value1.encode("utf-8")
+    value2_bytes = value2.encode("utf-8")
+    prepared_get = prepare_get(key)
     
     try:
         # 1. 设置初始值
-        requests.post(API_SET, params={"key": key, "value": value1}, timeout=5)
+        SESSION.post(API_SET, params={"key": key, "value": value1}, timeout=5)
         log_test("设置初始值", True)
         
         # 2. 高频访问触发热Key（需要先通过预筛选阈值）
         pass_pre_filter(key)
         # 继续高频访问以触发热Key
-        requests.get(API_GET_BATCH, params={"key": key, "count": 500}, timeout=30)
-        wait_for_promotion(6)
+        _fire_batches(key, 500)
+        wait_until_hot(key)
         
         # 3. 验证缓存中的初始值
-        response = requests.get(API_GET, params={"key": key}, timeout=5)
-        log_test("验证缓存中的初始值", response.text.strip() == value1,
+        response = SESSION.send(prepared_get, timeout=5)
+        log_test("验证缓存中的初始值", body_equals(response, value1_bytes),
                  f"返回值: {response.text.strip()}")
         
         # 4. 写入新值（应该触发缓存更新）
-        requests.post(API_SET, params={"key": key, "value": value2}, timeout=5)
+        SESSION.post(API_SET, params={"key": key, "value": value2}, timeout=5)
         log_test("写入新值", True)
         
-        # 5. 等待异步更新完成（写操作是异步更新缓存，需要等待更长时间）
+        # 5. 等待异步更新完成（写操作是异步更新缓存）
         # 写操作后，下次get操作会从Redis获取新值并更新缓存
-        # 或者等待自动刷新（10秒），这里我们尝试多次获取
-        time.sleep(1)
-        
-        # 6. 验证缓存是否已更新（多次尝试，因为写操作是异步的）
-        max_retries = 3
-        updated = False
-        for i in range(max_retries):
-            response = requests.get(API_GET, params={"key": key}, timeout=5)
-            if response.status_code == 200 and response.text.strip() == value2:
-                updated = True
-                break
-            time.sleep(5)
-        
+        # 或者等待自动刷新（10秒），这里轮询获取，值更新后立即结束，最长等待15秒
+        # 6. 验证缓存是否已更新
+        updated = wait_until(lambda: body_equals(SESSION.send(prepared_get, timeout=5), value2_bytes),
+                             timeout=15, initial=0.5)
+        actual = value2 if updated else SESSION.send(prepared_get, timeout=5).text.strip()
         log_test("验证写操作后缓存是否更新", updated,
-                 f"期望: {value2}, 实际: {response.text.strip() if not updated else value2} (尝试{max_retries}次)")
+                 f"期望: {value2}, 实际: {actual} (最长等待15秒)")
     
     except Exception as e:
         log_test("写操作触发缓存更新测试", False, str(e))
@@ -818,9 +1032,9 @@ def test_13_write_triggers_cache_update():
 
 def test_14_top_n_limit():
     """测试14: Top N限制测试 - 超过Top N数量的热Key是否被正确处理"""
-    print("\n" + "="*60)
-    print("测试14: Top N限制测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试14: Top N限制测试")
+    log("="*60)
     
     # Top N默认是10，我们创建15个key，每个都高频访问
     # 但只有Top 10应该成为热Key
@@ -829,24 +1043,18 @@ def test_14_top_n_limit():
     
     try:
         # 1. 创建多个key
-        keys = []
-        for i in range(test_key_count):
-            key = f"test:topn:{i}"
-            value = f"topn_value_{i}"
-            requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
-            keys.append(key)
+        pairs = [(f"test:topn:{i}", f"topn_value_{i}") for i in range(test_key_count)]
+        set_many(pairs)
+        keys = [key for key, _ in pairs]
         
         log_test(f"创建 {test_key_count} 个测试key", True)
         
         # 2. 对每个key进行高频访问（需要先通过预筛选阈值，确保QPS都超过阈值）
-        print(f"    对每个key进行高频访问（先通过预筛选阈值{PRE_FILTER_THRESHOLD}次，然后触发热Key）...")
-        for key in keys:
-            pass_pre_filter(key)
-            # 继续高频访问以触发热Key
-            requests.get(API_GET_BATCH, params={"key": key, "count": 500}, timeout=30)
+        log(f"    对每个key进行高频访问（先通过预筛选阈值{PRE_FILTER_THRESHOLD}次，然后触发热Key）...")
+        run_until_failure(trigger_hot_key, keys)
         
         # 3. 等待晋升完成
-        wait_for_promotion(6)
+        wait_until(lambda: bool(set(keys) & set(get_hot_keys.refresh())), timeout=8)
         
         # 4. 获取热Key列表
         hot_key_list = get_hot_keys()
@@ -862,11 +1070,7 @@ def test_14_top_n_limit():
                  f"热Key数量: {hot_key_count}, Top N限制: {top_n} (注意：可能包含之前测试的热Key)")
         
         # 6. 验证所有热Key都能正常访问
-        success_count = 0
-        for key in hot_key_list:
-            response = requests.get(API_GET, params={"key": key}, timeout=5)
-            if response.status_code == 200:
-                success_count += 1
+        success_count = count_accessible(hot_key_list)
         
         log_test(f"验证所有热Key都能正常访问 (成功: {success_count}/{hot_key_count})",
                  success_count == hot_key_count,
@@ -878,23 +1082,23 @@ def test_14_top_n_limit():
 
 def test_15_refresh_failure_handling():
     """测试15: 刷新失败处理测试 - 刷新失败超过阈值后，热Key是否被自动移除"""
-    print("\n" + "="*60)
-    print("测试15: 刷新失败处理测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试15: 刷新失败处理测试")
+    log("="*60)
     
     key = "test:refresh:failure:1"
     value = "refresh_failure_value"
     
     try:
         # 1. 设置key
-        requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
+        SESSION.post(API_SET, params={"key": key, "value": value}, timeout=5)
         log_test("设置测试key", True)
         
         # 2. 高频访问触发热Key（需要先通过预筛选阈值）
         pass_pre_filter(key)
         # 继续高频访问以触发热Key
-        requests.get(API_GET_BATCH, params={"key": key, "count": 500}, timeout=30)
-        wait_for_promotion(6)
+        _fire_batches(key, 500)
+        wait_until_hot(key)
         
         # 3. 验证key是否为热Key
         is_hot_before = check_is_hot_key(key)
@@ -907,12 +1111,12 @@ def test_15_refresh_failure_handling():
         # 4. 删除Redis中的key（模拟刷新失败场景）
         # 注意：如果删除API不存在，我们无法完全模拟刷新失败，但可以测试key不存在的情况
         try:
-            del_response = requests.post(API_DEL, params={"key": key}, timeout=5)
+            del_response = SESSION.post(API_DEL, params={"key": key}, timeout=5)
             if del_response.status_code == 200:
                 log_test("删除Redis中的key（模拟刷新失败）", True)
                 
                 # 5. 等待多次刷新周期（刷新间隔10秒，失败阈值3次，需要等待至少30秒）
-                print("    等待刷新失败超过阈值（刷新间隔10秒，失败阈值3次，等待35秒）...")
+                log("    等待刷新失败超过阈值（刷新间隔10秒，失败阈值3次，等待35秒）...")
                 time.sleep(35)
                 
                 # 6. 验证刷新失败处理
@@ -937,32 +1141,36 @@ def test_15_refresh_failure_handling():
 
 def test_16_monitor_api():
     """测试16: 监控API测试 - 验证监控API是否正常工作"""
-    print("\n" + "="*60)
-    print("测试16: 监控API测试")
-    print("="*60)
+    log("\n" + "="*60)
+    log("测试16: 监控API测试")
+    log("="*60)
     
+    test_key = "test:monitor:check:1"
     try:
+        # 三个只读监控接口互不依赖，通过连接池的多个连接并发请求，总耗时约为一次往返
+        # 调用__wrapped__绕过缓存和失败回退：必须真正请求接口，接口出错时抛出异常使用例失败
+        monitor_info, hot_keys, is_hot = run_concurrently(
+            lambda fetch: fetch(),
+            [get_monitor_info.__wrapped__, get_hot_keys.__wrapped__,
+             lambda: check_is_hot_key.__wrapped__(test_key)])
+        
         # 1. 测试监控信息API
-        monitor_info = get_monitor_info()
         log_test("获取监控信息API", monitor_info is not None and isinstance(monitor_info, dict),
                  f"返回数据类型: {type(monitor_info)}")
         
         # 2. 测试热Key列表API
-        hot_keys = get_hot_keys()
         log_test("获取热Key列表API", isinstance(hot_keys, list),
                  f"返回热Key数量: {len(hot_keys)}")
         
         # 3. 测试检查热KeyAPI
-        test_key = "test:monitor:check:1"
-        is_hot = check_is_hot_key(test_key)
         log_test("检查热Key API", isinstance(is_hot, bool),
                  f"key={test_key}, isHotKey={is_hot}")
         
         # 4. 测试统计信息API
         try:
-            response = requests.get(API_MONITOR_STATS, timeout=5)
+            response = SESSION.get(API_MONITOR_STATS, timeout=5)
             if response.status_code == 200:
-                stats_data = response.json()
+                stats_data = _json(response)
                 log_test("获取统计信息API", isinstance(stats_data, dict),
                         f"返回数据类型: {type(stats_data)}")
             else:
@@ -972,7 +1180,7 @@ def test_16_monitor_api():
         
         # 5. 测试手动刷新监控数据API
         try:
-            response = requests.post(API_MONITOR_REFRESH, timeout=5)
+            response = SESSION.post(API_MONITOR_REFRESH, timeout=5)
             log_test("手动刷新监控数据API", response.status_code in [200, 204],
                     f"状态码: {response.status_code}")
         except Exception as e:
@@ -982,6 +1190,14 @@ def test_16_monitor_api():
         log_test("监控API测试", False, str(e))
 
 
+def percentiles(values: List[float], ps: Tuple[int, ...] = (50, 95, 99)) -> List[float]:
+    """计算百分位数（线性插值，与numpy.percentile默认方式一致）"""
+    if len(values) < 2:
+        return [values[0] if values else 0] * len(ps)
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return [cuts[p - 1] for p in ps]
+
+
 def test_long_running(duration_minutes=30, check_interval=60):
     """长时间运行测试 - 验证OOM问题"""
     print("="*60)
@@ -996,7 +1212,7 @@ def test_long_running(duration_minutes=30, check_interval=60):
     print("="*60)
     
     try:
-        response = requests.get(API_MONITOR_INFO, timeout=5)
+        response = SESSION.get(API_MONITOR_INFO, timeout=5)
         if response.status_code != 200:
             print(f"\n错误: 无法连接到服务 {BASE_URL}")
             sys.exit(1)
@@ -1011,19 +1227,22 @@ def test_long_running(duration_minutes=30, check_interval=60):
     end_time = start_time + duration_minutes * 60
     key_index = 0
     key_prefix = "test:longrun"
-    health_history = []
-    max_hot_key_count = 0
+    # 健康快照逐行写入JSONL文件而不是保存在内存中，运行时长不受内存限制；最大值等汇总指标边运行边累计
+    health_log_path = f"healthlog-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
+    check_count = 0
+    last_health = None
+    max_hot_key_count = max_storage = max_recorder = 0
+    print(f"健康状态记录文件: {health_log_path}")
     
     def create_and_trigger_hotkey(key_prefix: str, index: int) -> bool:
         """创建并触发热Key（需要先通过预筛选阈值）"""
         key = f"{key_prefix}:{index}"
-        value = f"value_{index}"
         try:
-            requests.post(API_SET, params={"key": key, "value": value}, timeout=5)
+            SESSION.post(API_SET, params=set_params(key, f"value_{index}"), timeout=5)
             # 先通过预筛选阈值
             pass_pre_filter(key)
             # 继续高频访问以触发热Key
-            requests.get(API_GET_BATCH, params={"key": key, "count": 500}, timeout=30)
+            _fire_batches(key, 500)
             return True
         except Exception as e:
             print(f"创建热Key失败: key={key}, error={e}")
@@ -1032,7 +1251,7 @@ def test_long_running(duration_minutes=30, check_interval=60):
     def check_system_health() -> Dict:
         """检查系统健康状态"""
         monitor_info = get_monitor_info()
-        hot_keys = get_hot_keys()
+        hot_keys = get_hot_keys_from_info(monitor_info)
         return {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "hot_key_count": len(hot_keys),
@@ -1045,79 +1264,88 @@ def test_long_running(duration_minutes=30, check_interval=60):
         }
     
     def print_health_status(health: Dict):
-        """打印健康状态"""
-        print(f"\n[{health['timestamp']}] 系统健康状态:")
-        print(f"  热Key数量: {health['hot_key_count']} (Top N限制: 10)")
-        print(f"  存储层大小: {health['storage_size']} (限制: 200)")
-        print(f"  访问记录大小: {health['recorder_size']} (限制: 100000)")
-        print(f"  注册表大小: {health['registry_size']}")
-        print(f"  wrapGet QPS: {health['wrap_get_qps']:.2f}")
-        print(f"  热Key命中率: {health['hot_key_hit_rate']*100:.2f}%")
+        """打印健康状态（拼成一段后一次性写出）"""
+        lines = [
+            f"\n[{health['timestamp']}] 系统健康状态:",
+            f"  热Key数量: {health['hot_key_count']} (Top N限制: 10)",
+            f"  存储层大小: {health['storage_size']} (限制: 200)",
+            f"  访问记录大小: {health['recorder_size']} (限制: 100000)",
+            f"  注册表大小: {health['registry_size']}",
+            f"  wrapGet QPS: {health['wrap_get_qps']:.2f}",
+            f"  热Key命中率: {health['hot_key_hit_rate']*100:.2f}%",
+        ]
         if health['hot_keys']:
-            print(f"  热Key列表（前20个）: {health['hot_keys']}")
+            lines.append(f"  热Key列表（前20个）: {health['hot_keys']}")
+        with _stdout_lock:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
     
-    try:
-        while time.time() < end_time:
-            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 创建新的热Key...")
-            success_count = 0
-            for i in range(5):
-                if create_and_trigger_hotkey(key_prefix, key_index):
-                    success_count += 1
-                key_index += 1
-                time.sleep(0.5)
-            
-            print(f"  成功创建 {success_count} 个热Key")
-            print("  等待热Key晋升（6秒）...")
-            time.sleep(6)
-            
-            # 获取当前热Key列表
-            health = check_system_health()
-            hot_keys = health.get('hot_keys', [])
-            
-            # 方案1：在检查前再次访问热Key，确保缓存被填充
-            if hot_keys:
-                print(f"  访问热Key以确保缓存被填充（共{len(hot_keys)}个）...")
-                accessed_count = 0
-                for hot_key in hot_keys[:10]:  # 只访问前10个，避免过多请求
-                    try:
-                        # 访问1次即可，因为已经是热Key，会触发缓存写入
-                        requests.get(API_GET_BATCH, params={"key": hot_key, "count": 1}, timeout=5)
-                        accessed_count += 1
-                    except Exception as e:
-                        # 忽略访问失败，继续访问其他key
-                        pass
-                if accessed_count > 0:
-                    print(f"  已访问 {accessed_count} 个热Key，等待缓存更新（1秒）...")
-                    time.sleep(1)  # 等待缓存更新
-            
-            # 重新获取健康状态（缓存应该已经被填充）
-            health = check_system_health()
-            health_history.append(health)
-            print_health_status(health)
-            
-            hot_key_count = health['hot_key_count']
-            if hot_key_count > max_hot_key_count:
-                max_hot_key_count = hot_key_count
-            
-            if hot_key_count > 20:
-                print(f"\n⚠️  警告: 热Key数量 ({hot_key_count}) 超过Top N限制 (10) 的2倍！")
-            if health['storage_size'] > 200:
-                print(f"\n⚠️  警告: 存储层大小 ({health['storage_size']}) 超过预期 (200)！")
-            if health['recorder_size'] > 100000:
-                print(f"\n⚠️  警告: 访问记录大小 ({health['recorder_size']}) 超过预期 (100000)！")
-            
-            elapsed = time.time() - start_time
-            remaining = end_time - time.time()
-            print(f"\n已运行: {elapsed/60:.1f} 分钟, 剩余: {remaining/60:.1f} 分钟")
-            print(f"等待 {check_interval} 秒后进行下一次检查...")
-            time.sleep(check_interval)
-    
-    except KeyboardInterrupt:
-        print("\n\n测试被用户中断")
-    except Exception as e:
-        print(f"\n\n测试过程中发生错误: {e}")
-        import traceback
-        traceback.print_exc()
+    with open(health_log_path, "w", encoding="utf-8", buffering=1) as health_log:
+        try:
+            while time.time() < end_time:
+                print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 创建新的热Key...")
+                created_keys = []
+                for i in range(5):
+                    if create_and_trigger_hotkey(key_prefix, key_index):
+                        created_keys.append(f"{key_prefix}:{key_index}")
+                    key_index += 1
+                    time.sleep(0.5)
+                
+                print(f"  成功创建 {len(created_keys)} 个热Key")
+                print("  等待热Key晋升（最多6秒）...")
+                wait_until_hot(*created_keys, timeout=6)
+                
+                # 获取当前热Key列表
+                health = check_system_health()
+                hot_keys = health.get('hot_keys', [])
+                
+                # 方案1：在检查前再次访问热Key，确保缓存被填充
+                if hot_keys:
+                    print(f"  访问热Key以确保缓存被填充（共{len(hot_keys)}个）...")
+                    accessed_count = 0
+                    for hot_key in hot_keys[:10]:  # 只访问前10个，避免过多请求
+                        try:
+                            # 访问1次即可，因为已经是热Key，会触发缓存写入
+                            SESSION.get(API_GET_BATCH, params={"key": hot_key, "count": 1}, timeout=5)
+                            accessed_count += 1
+                        except Exception as e:
+                            # 忽略访问失败，继续访问其他key
+                            pass
+                    if accessed_count > 0:
+                        print(f"  已访问 {accessed_count} 个热Key，等待缓存更新（1秒）...")
+                        time.sleep(1)  # 等待缓存更新
+                
+                # 重新获取健康状态（缓存应该已经被填充）
+                health = check_system_health()
+                health_log.write(json.dumps(health, ensure_ascii=False) + "\n")
+                check_count += 1
+                last_health = health
+                print_health_status(health)
+                
+                hot_key_count = health['hot_key_count']
+                max_hot_key_count = max(max_hot_key_count, hot_key_count)
+                max_storage = max(max_storage, health['storage_size'])
+                max_recorder = max(max_recorder, health['recorder_size'])
+                
+                if hot_key_count > 20:
+                    print(f"\n⚠️  警告: 热Key数量 ({hot_key_count}) 超过Top N限制 (10) 的2倍！")
+                if health['storage_size'] > 200:
+                    print(f"\n⚠️  警告: 存储层大小 ({health['storage_size']}) 超过预期 (200)！")
+                if health['recorder_size'] > 100000:
+                    print(f"\n⚠️  警告: 访问记录大小 ({health['recorder_size']}) 超过预期 (100000)！")
+                
+                elapsed = time.time() - start_time
+                remaining = end_time - time.time()
+                print(f"\n已运行: {elapsed/60:.1f} 分钟, 剩余: {remaining/60:.1f} 分钟")
+                print(f"等待 {check_interval} 秒后进行下一次检查...")
+                time.sleep(check_interval)
+        
+        except KeyboardInterrupt:
+            print("\n\n测试被用户中断")
+        except Exception as e:
+            print(f"\n\n测试过程中发生错误: {e}")
+            import traceback
+            traceback.print_exc()
     
     # 输出测试总结
     print("\n" + "="*60)
@@ -1127,12 +1355,34 @@ def test_long_running(duration_minutes=30, check_interval=60):
     print(f"创建的热Key总数: {key_index}")
     print(f"最大热Key数量: {max_hot_key_count} (Top N限制: 10)")
     
-    if health_history:
-        last_health = health_history[-1]
+    if check_count:
         print(f"\n最终状态:")
         print(f"  热Key数量: {last_health['hot_key_count']}")
         print(f"  存储层大小: {last_health['storage_size']}")
         print(f"  访问记录大小: {last_health['recorder_size']}")
+        
+        # 百分位数需要全部样本：逐行读回记录文件，只保留QPS和命中率两列数值
+        # 中断时可能留下写了一半的末行，文件也可能在运行期间被删除，解析失败的行直接跳过
+        qps_samples = []
+        hit_rate_samples = []
+        try:
+            with open(health_log_path, "rb") as f:
+                for line in f:
+                    try:
+                        h = _loads(line)
+                        qps, hit_rate = h['wrap_get_qps'], h['hot_key_hit_rate']
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    qps_samples.append(qps)
+                    hit_rate_samples.append(hit_rate)
+        except OSError as e:
+            print(f"\n读取健康状态记录文件失败: {e}")
+        
+        qps_p50, qps_p95, qps_p99 = percentiles(qps_samples)
+        hit_p50, hit_p95, hit_p99 = percentiles(hit_rate_samples)
+        print(f"\n运行期间指标分布（共{len(qps_samples)}次检查，p50/p95/p99）:")
+        print(f"  wrapGet QPS: {qps_p50:.2f} / {qps_p95:.2f} / {qps_p99:.2f}")
+        print(f"  热Key命中率: {hit_p50*100:.2f}% / {hit_p95*100:.2f}% / {hit_p99*100:.2f}%")
     
     print("\n" + "="*60)
     print("结果分析")
@@ -1143,16 +1393,12 @@ def test_long_running(duration_minutes=30, check_interval=60):
     else:
         print(f"⚠️  热Key数量 ({max_hot_key_count}) 超过Top N限制 (10) 的2倍")
     
-    if health_history:
-        storage_sizes = [h['storage_size'] for h in health_history]
-        max_storage = max(storage_sizes)
+    if check_count:
         if max_storage <= 200:
             print(f"✅ 存储层大小控制正常 (最大: {max_storage})")
         else:
             print(f"⚠️  存储层大小 ({max_storage}) 超过预期 (200)")
         
-        recorder_sizes = [h['recorder_size'] for h in health_history]
-        max_recorder = max(recorder_sizes)
         if max_recorder <= 100000:
             print(f"✅ 访问记录大小控制正常 (最大: {max_recorder})")
         else:
@@ -1169,7 +1415,7 @@ def test_monitor():
     
     try:
         monitor_info = get_monitor_info()
-        hot_keys = get_hot_keys()
+        hot_keys = get_hot_keys_from_info(monitor_info)
         
         print(f"时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"热Key数量: {len(hot_keys)} (Top N限制: 10)")
@@ -1225,9 +1471,14 @@ def main():
     parser.add_argument('--monitor', action='store_true', help='监控系统状态')
     parser.add_argument('--duration', type=int, default=30, help='长时间测试持续时间（分钟），默认30')
     parser.add_argument('--interval', type=int, default=60, help='长时间测试检查间隔（秒），默认60')
+    parser.add_argument('--workers', type=int, default=8, help='基础功能测试并发执行的用例数，默认8（1为串行）')
+    parser.add_argument('--verbose', action='store_true', help='输出等待过程等详细进度信息')
     
     args = parser.parse_args()
     
+    global VERBOSE
+    VERBOSE = args.verbose
+    
     if args.monitor:
         test_monitor()
         return
@@ -1251,7 +1502,7 @@ def main():
     
     # 检查服务是否可用
     try:
-        response = requests.get(API_MONITOR_INFO, timeout=5)
+        response = SESSION.get(API_MONITOR_INFO, timeout=5)
         if response.status_code != 200:
             print(f"\n警告: 无法连接到服务 {BASE_URL}")
             print("请确保服务已启动并运行在 8080 端口")
@@ -1262,38 +1513,61 @@ def main():
         sys.exit(1)
     
     # 执行所有测试
-    test_1_basic_set_get()
-    test_2_hot_key_detection()
-    test_3_warm_key_detection()
-    test_4_capacity_limit()
-    test_5_concurrent_access()
-    test_6_cache_hit_rate()
-    test_7_edge_cases()
-    test_8_key_not_exists()
-    test_9_multiple_hot_keys()
-    test_10_value_update()
-    test_11_delete_hot_key()
-    test_12_hot_key_demotion()
-    test_13_write_triggers_cache_update()
-    test_14_top_n_limit()
-    test_15_refresh_failure_handling()
-    test_16_monitor_api()
+    # 各用例使用互不重叠的key前缀，大部分时间在等待HTTP响应和晋升，可以并发执行
+    # 按预计耗时从长到短提交：降级（约1~2分钟）、刷新失败（约35秒）等长用例最先开始，
+    # 避免它们排在线程池队尾、在其他用例结束后才启动而拉长总耗时
+    parallel_tests = [
+        test_12_hot_key_demotion,
+        test_15_refresh_failure_handling,
+        test_2_hot_key_detection,
+        test_3_warm_key_detection,
+        test_10_value_update,
+        test_13_write_triggers_cache_update,
+        test_6_cache_hit_rate,
+        test_9_multiple_hot_keys,
+        test_11_delete_hot_key,
+        test_1_basic_set_get,
+        test_7_edge_cases,
+        test_8_key_not_exists,
+        test_16_monitor_api,
+    ]
+    # 并发组中test_2/test_3/test_12按目标QPS匀速发压并断言客户端QPS，与其他用例的突发请求共用进程仍是安全的：
+    # - 其余突发都是少量请求：test_9为5个key各5个批量请求，test_6为100次GET，其他用例为每个key 5个批量请求，
+    #   访问次数由服务端在get-batch内计数，客户端只占用几十毫秒CPU，而匀速发压阶段持续约10秒
+    # - send_at_rate默认落后即追赶，短暂的GIL争用只会推迟个别请求，10秒内的总请求数和平均QPS不受影响；
+    #   test_3（指定max_lag不追赶）的目标20 QPS距温Key下限10 QPS留有一倍余量
+    # 新增用例若会持续不间断地发请求，应放入下面的串行组
+    # 容量限制和Top N限制测试会冲击全局的访问记录容量和Top N名额；并发访问测试的50个线程不间断发请求，
+    # 会长时间占用GIL，拖慢上述匀速发压的用例。这些用例在并发用例结束后串行执行
+    serial_tests = [
+        test_4_capacity_limit,
+        test_14_top_n_limit,
+        test_5_concurrent_access,
+    ]
+    
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [executor.submit(run_test, test) for test in parallel_tests]
+        for future in as_completed(futures):
+            future.result()
+    
+    for test in serial_tests:
+        run_test(test)
     
     # 输出测试结果汇总
     print("\n" + "="*60)
     print("测试结果汇总")
     print("="*60)
-    print(f"通过: {test_results['passed']}")
-    print(f"失败: {test_results['failed']}")
-    print(f"总计: {test_results['passed'] + test_results['failed']}")
+    print(f"通过: {test_results.passed}")
+    print(f"失败: {test_results.failed}")
+    print(f"总计: {test_results.passed + test_results.failed}")
     
-    if test_results['errors']:
+    if test_results.errors:
         print("\n失败详情:")
-        for error in test_results['errors']:
+        for error in test_results.errors:
             print(f"  - {error}")
     
     # 返回退出码
-    if test_results['failed'] > 0:
+    if test_results.failed > 0:
         print("\n测试未完全通过，请检查上述错误")
         sys.exit(1)
     else: